@@ -2,7 +2,6 @@ import socket
 import struct
 import binascii
 import netifaces
-from functools import reduce
 from queue import Queue
 import time
 
@@ -10,6 +9,10 @@ ETH_P_BMS = 0x7fff
 ETH_P_VLAN = 0x8100
 BuffSize = 65536
 AF_PACKET = 17
+ETH_P_BMS_PROTO = socket.htons(ETH_P_BMS)
+ETH_P_BMS_BYTES = struct.pack("!H", ETH_P_BMS)
+ETH_P_VLAN_BYTES = struct.pack("!H", ETH_P_VLAN)
+ETH_HEADER = struct.Struct("!6s6s2s")
 
 VAR_PACKET = {
     "ver": None,
@@ -37,12 +40,22 @@ class Demo(object):
         self.dst_mac = 'b4:96:91:33:8a:d8'
         self.src_mac = '92:64:af:c3:31:dd'
         self.vlan = '1740'
+        self.send_sockets = {}
         self.card = "net1"
 
     def create_queue(self):
         q = Queue()
         return q
 
+    def get_send_socket(self, net_card):
+        # reuse one bound raw socket per net card instead of opening one per frame
+        raw_socket = self.send_sockets.get(net_card)
+        if raw_socket is None:
+            raw_socket = socket.socket(socket.PF_PACKET, socket.SOCK_RAW, ETH_P_BMS_PROTO)
+            raw_socket.bind((net_card, ETH_P_BMS_PROTO))
+            self.send_sockets[net_card] = raw_socket
+        return raw_socket
+
     def run(self):
         self.q = self.create_queue()
         ack_packet = self.var_packet
@@ -52,7 +65,9 @@ class Demo(object):
 
 
     def recv_frame(self):
-        raw_socket = socket.socket(socket.PF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_BMS))
+        raw_socket = socket.socket(socket.PF_PACKET, socket.SOCK_RAW, ETH_P_BMS_PROTO)
+        buffer = bytearray(BuffSize)
+        view = memoryview(buffer)
         while True:
             print("------------------------------------------------------")
             if not self.q.empty():
@@ -61,12 +76,9 @@ class Demo(object):
                 dst_mac = self.dst_macl
                 src_mac = self.src_mac
                 self.send_frame(self.card, dst_mac, src_mac, ack_packet)
-            packet, packet_info = raw_socket.recvfrom(BuffSize)
-            ethHeader = packet[0:14]
-            eth_hdr = struct.unpack("!6s6s2s", ethHeader)
-            local_mac, src_mac, eth_type = binascii.hexlify(eth_hdr[0]), binascii.hexlify(eth_hdr[1]), \
-                                           binascii.hexlify(eth_hdr[2])
-            data = packet[14:]
+            nbytes, packet_info = raw_socket.recvfrom_into(buffer)
+            local_mac, src_mac, eth_type = map(binascii.hexlify, ETH_HEADER.unpack_from(buffer))
+            data = view[ETH_HEADER.size:nbytes].tobytes()
             print(time.asctime( time.localtime(time.time())))
             print("dst mac: {}".format(local_mac))
             print("src mac: {}".format(src_mac))
@@ -92,31 +104,25 @@ class Demo(object):
 
 
     def send_vlan_frame(self, net_card, dst_mac, src_mac, vlan, data='hello'):
-        raw_socket = socket.socket(socket.PF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_BMS))
-        raw_socket.bind((net_card, socket.htons(ETH_P_BMS)))
+        raw_socket = self.get_send_socket(net_card)
 
         bytes_srcmac = self.format_mac_bytes(self.format_mac(src_mac))
         bytes_dstmac = self.format_mac_bytes(self.format_mac(dst_mac))
         bytes_vlan = self.format_mac_bytes(self.i2b_hex(vlan))
-        ETH_P_VLAN_BY = self.format_mac_bytes(self.i2b_hex(ETH_P_VLAN))
-        ETH_P_BMS_BY = self.format_mac_bytes(self.i2b_hex(ETH_P_BMS))
 
-        vlan_tag = struct.pack("!2s2s", ETH_P_VLAN_BY, bytes_vlan)
-        packet = struct.pack("!6s6s4s2s", bytes_dstmac, bytes_srcmac, vlan_tag, ETH_P_BMS_BY)
+        packet = struct.pack("!6s6s2s2s2s", bytes_dstmac, bytes_srcmac, ETH_P_VLAN_BYTES, bytes_vlan, ETH_P_BMS_BYTES)
 
-        raw_socket.send(packet + data.encode('utf8'))
+        raw_socket.sendmsg([packet, data.encode('utf8')])
 
     def send_frame(self, net_card, dst_mac, src_mac, data='hello'):
-        raw_socket = socket.socket(socket.PF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_BMS))
-        raw_socket.bind((net_card, socket.htons(ETH_P_BMS)))
+        raw_socket = self.get_send_socket(net_card)
 
         bytes_srcmac = self.format_mac_bytes(self.format_mac(src_mac))
         bytes_dstmac = self.format_mac_bytes(self.format_mac(dst_mac))
-        ETH_P_BMS_BY = self.format_mac_bytes(self.i2b_hex(ETH_P_BMS))
 
-        packet = struct.pack("!6s6s2s", bytes_dstmac, bytes_srcmac, ETH_P_BMS_BY)
+        packet = struct.pack("!6s6s2s", bytes_dstmac, bytes_srcmac, ETH_P_BMS_BYTES)
 
-        raw_socket.send(packet + data.encode('utf8'))
+        raw_socket.sendmsg([packet, data.encode('utf8')])
 
     def format_mac(self, mac_address):
         return mac_address.replace(":", "")
@@ -124,7 +130,7 @@ class Demo(object):
 
 
     def format_mac_bytes(self, msg):
-        return reduce(lambda x, y: x + y, [binascii.unhexlify(msg[i:i + 2]) for i in range(0, len(msg), 2)])
+        return binascii.unhexlify(msg)
 
 
     def i2b_hex(self, protocol):
@@ -135,12 +141,13 @@ class Demo(object):
 
     def get_net(self, local_mac):
         net_list = []
+        local_mac = self.format_mac(local_mac)
         for i in netifaces.interfaces():
             if i == "lo":
                 continue
             else:
                 mac = netifaces.ifaddresses(i)[AF_PACKET][0]["addr"]
-                if self.format_mac(local_mac) == mac:
+                if local_mac == mac:
                     net_list.append(i)
         return net_list
 